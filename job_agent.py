@@ -1,8 +1,13 @@
 import os
 import requests
-import json
+import orjson
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import chain
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- CONFIGURATION ---
 # Strict keywords - The job TITLE must contain at least one of these
@@ -25,48 +30,109 @@ NEGATIVE_KEYWORDS = ["Marketing", "Sales", "HR", "Recruiting", "Design", "Legal"
 
 JOB_RESULTS_DIR = "job_results"
 
-def contains_keyword(text, keywords):
+# Last ArbeitNow response validators + filtered jobs, reused when the feed is unchanged (HTTP 304)
+ARBEITNOW_CACHE_FILE = os.path.join(JOB_RESULTS_DIR, ".cache", "arbeitnow.json")
+
+# (connect, read) timeouts in seconds so a stalled API can't hang the run
+REQUEST_TIMEOUT = (5, 30)
+
+# Shared session: keeps connections alive and retries transient connection failures.
+# Read retries are disabled: a slow SerpApi response is still billed, so it must not be re-sent
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3)
+))
+
+# Single precompiled alternation of all keywords, so each title is scanned once.
+# Word boundaries ensure exact word match (e.g. match "AWS" but not "Paws")
+_KW_RE = re.compile(
+    r'(?<!\w)(' + '|'.join(re.escape(k) for k in BASE_KEYWORDS) + r')(?!\w)',
+    re.IGNORECASE
+)
+
+# Negative keywords are plain substring matches (case-insensitive), checked in one pass over the title
+_NEG_RE = re.compile('|'.join(re.escape(n) for n in NEGATIVE_KEYWORDS), re.IGNORECASE)
+
+def contains_keyword(text, pattern):
     """
-    Checks if any keyword exists in text (case-insensitive).
+    Checks if the precompiled keyword pattern matches text (case-insensitive).
     Uses word boundaries to avoid partial matches (e.g., preventing 'law' matching 'lawyer').
     """
     if not text:
         return False
-    text = text.lower()
-    for k in keywords:
-        # Regex for word boundary to ensure exact word match (e.g. match "AWS" but not "Paws")
-        pattern = r'(?<!\w)' + re.escape(k.lower()) + r'(?!\w)'
-        if re.search(pattern, text):
-            return True
-    return False
+    return pattern.search(text) is not None
+
+def load_arbeitnow_cache():
+    """
+    Loads the cached ArbeitNow result, or None if missing, malformed or built with different keywords.
+    """
+    try:
+        with open(ARBEITNOW_CACHE_FILE, "rb") as f:
+            cache = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(cache, dict) or not isinstance(cache.get("jobs"), list):
+        return None
+    # Cached jobs were filtered with the patterns of that run; discard them if the keywords changed
+    if cache.get("patterns") != [_KW_RE.pattern, _NEG_RE.pattern]:
+        return None
+    return cache
+
+def save_arbeitnow_cache(response, jobs):
+    """Stores the response's ETag/Last-Modified alongside the filtered jobs."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    cache = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "patterns": [_KW_RE.pattern, _NEG_RE.pattern],
+        "jobs": jobs
+    }
+    try:
+        os.makedirs(os.path.dirname(ARBEITNOW_CACHE_FILE), exist_ok=True)
+        with open(ARBEITNOW_CACHE_FILE, "wb") as f:
+            f.write(orjson.dumps(cache))
+    except OSError as e:
+        print(f"Could not write ArbeitNow cache: {e}")
 
 def fetch_arbeitnow_jobs():
     """Fetches jobs from ArbeitNow (Free API)."""
     print("Fetching ArbeitNow jobs...")
+    cache = load_arbeitnow_cache()
+    
+    # Conditional request: the server answers 304 if the feed hasn't changed since the cached run
+    headers = {}
+    if cache and cache.get("etag"):
+        headers["If-None-Match"] = cache["etag"]
+    if cache and cache.get("last_modified"):
+        headers["If-Modified-Since"] = cache["last_modified"]
+    
     try:
-        response = requests.get("https://www.arbeitnow.com/api/job-board-api")
+        response = SESSION.get("https://www.arbeitnow.com/api/job-board-api", headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cache:
+            print("ArbeitNow feed unchanged, using cached results.")
+            return cache["jobs"]
         if response.status_code == 200:
-            data = response.json().get("data", [])
-            filtered = []
-            for job in data:
-                title = job['title']
-                
-                # 1. Check matches
-                is_match = contains_keyword(title, BASE_KEYWORDS)
-                
-                # 2. Filter out garbage
-                is_garbage = any(n.lower() in title.lower() for n in NEGATIVE_KEYWORDS)
-                
-                # FIX: Only add if it matches keywords AND is not garbage. 
-                # Removed the "OR job['remote']" check which caused the wrong titles.
-                if is_match and not is_garbage:
-                     filtered.append({
-                        "title": title,
-                        "company": job['company_name'],
-                        "location": job['location'],
-                        "url": job['url'],
-                        "source": "ArbeitNow"
-                    })
+            data = orjson.loads(response.content).get("data", [])
+            # Only keep titles that match a keyword AND contain no negative keyword.
+            # (The old "OR job['remote']" check let unrelated titles through.)
+            filtered = [
+                {
+                    "title": job['title'],
+                    "company": job['company_name'],
+                    "location": job['location'],
+                    "url": job['url'],
+                    "source": "ArbeitNow"
+                }
+                for job in data
+                if contains_keyword(title_lower := job['title'].lower(), _KW_RE)
+                and _NEG_RE.search(title_lower) is None
+            ]
+            save_arbeitnow_cache(response, filtered)
             return filtered
     except Exception as e:
         print(f"Error fetching ArbeitNow: {e}")
@@ -101,16 +167,16 @@ def fetch_serpapi_jobs(api_key):
     }
     
     try:
-        response = requests.get("https://serpapi.com/search.json", params=params)
+        response = SESSION.get("https://serpapi.com/search.json", params=params, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
-            results = response.json().get("jobs_results", [])
+            results = orjson.loads(response.content).get("jobs_results", [])
             for job in results:
                 # Extract source (e.g., "via LinkedIn")
                 via = job.get('via', 'Google Jobs')
                 
                 # Filter out if the source is generic garbage, keep the good ones
                 # Google Jobs aggregates them, so we just verify the title matches our strict logic
-                if contains_keyword(job.get('title'), BASE_KEYWORDS):
+                if contains_keyword(job.get('title'), _KW_RE):
                     
                     # Get best link
                     link = job.get('share_link')
@@ -129,42 +195,69 @@ def fetch_serpapi_jobs(api_key):
         
     return all_jobs
 
+def deduplicate_jobs(jobs):
+    """Drops postings listed by more than one source, keyed by (title, company)."""
+    seen = set()
+    unique = []
+    for job in jobs:
+        key = ((job['title'] or '').strip().lower(), (job['company'] or '').strip().lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(job)
+    return unique
+
 def save_results(jobs):
     if not os.path.exists(JOB_RESULTS_DIR):
         os.makedirs(JOB_RESULTS_DIR)
     
-    date_str = datetime.now().strftime("%d%m%y")
+    # Single timestamp for both the file name and the report header
+    now = datetime.now()
+    date_str = now.strftime("%d%m%y")
     filename = f"{date_str}_Result.txt"
     filepath = os.path.join(JOB_RESULTS_DIR, filename)
     
     # Sort jobs by source for better readability
-    jobs.sort(key=lambda x: x['source'])
+    jobs.sort(key=itemgetter('source'))
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(f"JOB SEARCH REPORT - {datetime.now().strftime('%Y-%m-%d')}\n")
-        f.write(f"Total Jobs Found: {len(jobs)}\n")
-        f.write("==================================================\n\n")
-        
-        if not jobs:
-            f.write("No new matching jobs found in the last 24h.\n")
-        
-        for job in jobs:
-            f.write(f"Role:     {job['title']}\n")
-            f.write(f"Company:  {job['company']}\n")
-            f.write(f"Location: {job['location']}\n")
-            f.write(f"Source:   {job['source']}\n")
-            f.write(f"Link:     {job['url']}\n")
-            f.write("-" * 50 + "\n")
+    # Build the whole report in memory and write it out in one call
+    parts = [
+        f"JOB SEARCH REPORT - {now.strftime('%Y-%m-%d')}\n",
+        f"Total Jobs Found: {len(jobs)}\n",
+        "==================================================\n\n",
+    ]
+    
+    if not jobs:
+        parts.append("No new matching jobs found in the last 24h.\n")
+    
+    for job in jobs:
+        parts.append(
+            f"Role:     {job['title']}\n"
+            f"Company:  {job['company']}\n"
+            f"Location: {job['location']}\n"
+            f"Source:   {job['source']}\n"
+            f"Link:     {job['url']}\n"
+            + "-" * 50 + "\n"
+        )
+    
+    # Encode once and write bytes directly, bypassing the text-mode wrapper
+    with open(filepath, "wb") as f:
+        f.write("".join(parts).encode("utf-8"))
             
     print(f"Successfully saved {len(jobs)} jobs to {filepath}")
 
 def main():
     serpapi_key = os.environ.get("SERPAPI_KEY")
     
-    arbeitnow_jobs = fetch_arbeitnow_jobs()
-    serpapi_jobs = fetch_serpapi_jobs(serpapi_key)
+    # Both sources are independent network calls, so fetch them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        arbeitnow_future = executor.submit(fetch_arbeitnow_jobs)
+        serpapi_future = executor.submit(fetch_serpapi_jobs, serpapi_key)
+        arbeitnow_jobs = arbeitnow_future.result()
+        serpapi_jobs = serpapi_future.result()
     
-    all_jobs = arbeitnow_jobs + serpapi_jobs
+    # Stream both sources straight into the dedup pass instead of concatenating them first
+    all_jobs = deduplicate_jobs(chain(arbeitnow_jobs, serpapi_jobs))
     save_results(all_jobs)
 
 if __name__ == "__main__":